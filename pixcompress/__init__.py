@@ -1,3 +1,3 @@
 '''pixcompress — small, pragmatic image compression utils.'''
 __version__ = "0.1.3"
-from .core import compress, compress_batch
+from .core import CompressResult, compress, compress_batch, compress_batch_async
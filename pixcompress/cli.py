@@ -21,8 +21,8 @@ def cli(input_file, quality, max_width, max_height, output):
     
     try:
         result=compress(str(input_path), str(output), quality=quality, max_size=max_size)
-        original_size=result['orig_size']
-        compressed_size=result['new_size']
+        original_size=result.orig_size
+        compressed_size=result.new_size
         ratio=(1-compressed_size / original_size) * 100
         click.echo(f"Compressed: {input_path.name}")
         click.echo(f"Output: {output}")
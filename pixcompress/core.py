@@ -1,7 +1,180 @@
 from pathlib import Path
-from PIL import Image
+from PIL import Image, features
+import asyncio
+import io
+import mmap
+import os
 import shutil
-from typing import Union, Optional
+import subprocess
+import warnings
+from functools import partial
+from typing import NamedTuple, Union, Optional
+
+
+class CompressResult(NamedTuple):
+    """Result of compressing one image.
+
+    A NamedTuple instead of a dict: a fraction of the per-result memory on
+    million-file batches, and field access by name. Use `._asdict()` where
+    a plain dict is needed.
+    """
+    src: str
+    dst: str = ""
+    orig_size: int = 0
+    new_size: int = 0
+    error: Optional[str] = None
+
+#warn once if Pillow is linked against stock libjpeg instead of libjpeg-turbo;
+#the SIMD DCT/Huffman routines in turbo make JPEG encode several times faster
+_LIBJPEG_TURBO = features.check_feature("libjpeg_turbo")
+_warned_no_turbo = False
+
+
+def _check_libjpeg_turbo():
+    """Warn (once) when Pillow is not built against libjpeg-turbo.
+
+    JPEG encode/decode is the dominant CPU cost per file; libjpeg-turbo's
+    SIMD routines are typically 2-6x faster than stock libjpeg. See the
+    README for install options that pull in a turbo-backed Pillow.
+    """
+    global _warned_no_turbo
+    if not _LIBJPEG_TURBO and not _warned_no_turbo:
+        warnings.warn(
+            "Pillow is not built with libjpeg-turbo; JPEG compression will be "
+            "noticeably slower. See the pixcompress README for install notes.",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+        _warned_no_turbo = True
+
+
+#libimagequant (pngquant's core) beats PIL's median cut on both speed and
+#output size for palette PNGs; fall back to PIL when it isn't installed
+try:
+    import pyimagequant
+except ImportError:
+    pyimagequant = None
+
+#piexif rewrites JPEG EXIF segments without touching the compressed pixel
+#data, enabling metadata-only updates with no decode/encode at all
+try:
+    import piexif
+except ImportError:
+    piexif = None
+
+#libvips streams decode->resize->encode tile by tile in one pass, keeping
+#the working set in cache instead of materializing full bitmaps
+try:
+    import pyvips
+except ImportError:
+    pyvips = None
+
+#oxipng recompresses PNGs 10-30% smaller than zlib's moderate level and
+#parallelizes filter search across cores; usable as a CLI or via the
+#optional python bindings
+try:
+    import oxipng as _oxipng_mod
+except ImportError:
+    _oxipng_mod = None
+_OXIPNG_BIN = shutil.which("oxipng")
+
+
+def _optimize_png(dst_p: Path):
+    """Recompress a saved PNG in place with oxipng, if available.
+
+    Tries the `oxipng` binary first (multi-threaded), then the optional
+    Python bindings. Silently leaves the file as-is when neither exists
+    or oxipng fails.
+
+    Args:
+        dst_p (Path): Path to the PNG written by `Image.save`.
+
+    Returns:
+        bool: True if an oxipng pass ran, False otherwise.
+    """
+    if _OXIPNG_BIN:
+        proc = subprocess.run(
+            [_OXIPNG_BIN, "-o", "4", "--threads", str(os.cpu_count() or 1), str(dst_p)],
+            capture_output=True)
+        return proc.returncode == 0
+    if _oxipng_mod is not None:
+        try:
+            _oxipng_mod.optimize(str(dst_p), level=4)
+        except Exception:
+            return False
+        return True
+    return False
+
+#read/write buffer size; large enough that syscall count stops mattering
+_IO_BUFFER_SIZE = 1 << 20
+
+#sources above this are memory-mapped: the decoder pages bytes in on demand
+#instead of copying them through read(), and workers decoding the same file
+#share the pages
+_MMAP_MIN_BYTES = 16 * 1024 * 1024
+
+
+def _fadvise(fileobj, advice: str):
+    """Best-effort posix_fadvise on an open file object.
+
+    No-op on platforms without `os.posix_fadvise` (macOS, Windows) or when
+    the descriptor rejects the hint.
+
+    Args:
+        fileobj: Open file object backed by a real descriptor.
+        advice (str): Name of the `os.POSIX_FADV_*` constant to apply.
+    """
+    adv = getattr(os, advice, None)
+    if adv is None:
+        return
+    try:
+        os.posix_fadvise(fileobj.fileno(), 0, 0, adv)
+    except OSError:
+        pass
+
+
+def _save_buffered(img: Image.Image, dst_p: Path, **save_kwargs):
+    """Save an image through an explicitly buffered file object.
+
+    PIL writes compressed output in small chunks; a 1 MiB buffer collapses
+    those into a handful of write() syscalls.
+
+    Args:
+        img (Image.Image): PIL Image object to save.
+        dst_p (Path): Destination file path.
+        **save_kwargs: Keyword arguments passed to `Image.save` (must include
+            `format`, since a file object carries no filename to infer it from).
+    """
+    with open(dst_p, "wb", buffering=_IO_BUFFER_SIZE) as f:
+        img.save(f, **save_kwargs)
+
+
+#palette construction runs on at most this many pixels per side; a sampled
+#palette is visually identical to one built from the full image
+_PALETTE_SAMPLE_SIZE = 512
+
+
+def _quantize_adaptive(img: Image.Image, colors: int):
+    """Quantize an image to an adaptive palette of at most `colors` entries.
+
+    For large RGB images the palette is computed on a 512x512 nearest-
+    neighbour downsample and then applied to the full image, so the
+    expensive median-cut step costs the same regardless of resolution.
+
+    Args:
+        img (Image.Image): Source image ("RGB" or "L").
+        colors (int): Maximum number of palette entries.
+
+    Returns:
+        Image.Image: Palettized ("P" mode) image.
+    """
+    if img.mode == "RGB" and max(img.size) > 2 * _PALETTE_SAMPLE_SIZE:
+        sample = img.copy()
+        sample.thumbnail((_PALETTE_SAMPLE_SIZE, _PALETTE_SAMPLE_SIZE),
+                         Image.NEAREST)
+        palette_img = sample.convert("P", palette=Image.ADAPTIVE, colors=colors)
+        return img.quantize(palette=palette_img)
+    return img.convert("P", palette=Image.ADAPTIVE, colors=colors)
 
 
 def _ensure_dir(path: Path):
@@ -36,32 +209,241 @@ def _get_exif(img: Image.Image):
     return img.info.get("exif", None)
 
 
+#target-size decisions keyed by (src_w, src_h, max_w, max_h); batches of
+#same-size images resolve their fit geometry once instead of per image
+_FIT_SIZE_CACHE = {}
+
+#more distinct geometries than any sane batch produces; reset rather than
+#let a long-lived process accumulate entries forever
+_FIT_SIZE_CACHE_MAX = 4096
+
+#sentinel bound standing in for "no limit" on an axis
+_NO_LIMIT = 1 << 30
+
+
+def _fit_within(size, max_size):
+    """Compute the aspect-preserving target size for a bounding box.
+
+    Results are memoized so a batch of same-dimension images only computes
+    the fit geometry once.
+
+    Args:
+        size (tuple): Source (width, height).
+        max_size (tuple): Bounding (max_width, max_height).
+
+    Returns:
+        tuple or None: Target (width, height), or None if no resize is needed.
+    """
+    key = (size[0], size[1], max_size[0], max_size[1])
+    try:
+        return _FIT_SIZE_CACHE[key]
+    except KeyError:
+        pass
+    w, h = size
+    mx_w, mx_h = max_size
+    #folding 1.0 into the min makes "already fits" fall out of the same
+    #computation instead of a separate comparison branch
+    scale = min(mx_w / w, mx_h / h, 1.0)
+    if scale == 1.0:
+        target = None
+    else:
+        target = (max(1, round(w * scale)), max(1, round(h * scale)))
+    if len(_FIT_SIZE_CACHE) >= _FIT_SIZE_CACHE_MAX:
+        _FIT_SIZE_CACHE.clear()
+    _FIT_SIZE_CACHE[key] = target
+    return target
+
+
 def _resize_if_needed(img: Image.Image, max_size):
     """Resize an image to fit within max dimensions while preserving aspect ratio.
 
     Args:
         img (Image.Image): PIL Image object to resize.
-        max_size (tuple or None): Maximum width and height as (max_width, max_height). 
-                                  If None or any dimension is 0, no resizing occurs.
-    
+        max_size (tuple or None): Maximum width and height as (max_width, max_height).
+                                  None disables resizing; a 0 dimension means
+                                  no limit on that axis.
+
     Returns:
         Image.Image: The resized image, or original image if resizing was not needed.
-    
+
     Example:
         >>> resized_img = _resize_if_needed(img, (800, 600))
         >>> resized_img.size
         (800, 450)
     """
-    if not max_size:
-        return img
-    mx_w, mx_h = max_size
-    if mx_w == 0 or mx_h == 0:
+    #no bound at all: skip the fit computation and its cache entirely, so
+    #resize-free calls don't grow the memo one entry per source size
+    mx_w, mx_h = max_size or (0, 0)
+    if not (mx_w or mx_h):
         return img
-    w, h = img.size
-    if w <= mx_w and h <= mx_h:
+    #treat a 0 dimension as a sentinel-large bound so the common
+    #needs-resize path runs without special-case branches
+    target = _fit_within(img.size, (mx_w or _NO_LIMIT, mx_h or _NO_LIMIT))
+    if target is None:
         return img
-    img.thumbnail((mx_w, mx_h), Image.LANCZOS)
-    return img
+    #reducing_gap keeps thumbnail()'s cheap box-reduce pre-pass before the
+    #final LANCZOS step
+    return img.resize(target, Image.LANCZOS, reducing_gap=2.0)
+
+
+def _save_jpeg(img, src_p, dst_p, *, quality, optimize, progressive,
+               exif_bytes, **_):
+    """Save `img` to `dst_p` as JPEG."""
+    save_kwargs = {
+        "format": "JPEG",
+        "quality": int(quality),
+        "optimize": optimize,
+        "progressive": progressive,
+    }
+    if exif_bytes:
+        save_kwargs["exif"] = exif_bytes
+    _save_buffered(img, dst_p, **save_kwargs)
+
+
+def _save_webp(img, src_p, dst_p, *, quality, webp_lossless, webp_method, **_):
+    """Save `img` to `dst_p` as WebP, scaling encoder effort with size."""
+    if webp_method is None:
+        #method 6's exhaustive search dominates encode time on big images
+        #for ~1% size gain; back off as pixel count grows
+        px = img.size[0] * img.size[1]
+        webp_method = 6 if px < 500_000 else 4 if px < 4_000_000 else 2
+    save_kwargs = {
+        "format": "WEBP",
+        "quality": int(quality),
+        "lossless": webp_lossless,
+        "method": webp_method,
+    }
+    if img.mode == "RGBA":
+        #don't spend cycles preserving RGB values under fully transparent
+        #pixels, and compress the alpha plane a bit harder than the color
+        save_kwargs["exact"] = False
+        save_kwargs["alpha_quality"] = min(int(quality), 80)
+    else:
+        save_kwargs["minimize_size"] = False
+    _save_buffered(img, dst_p, **save_kwargs)
+
+
+def _save_png(img, src_p, dst_p, *, quality, optimize, **_):
+    """Save `img` to `dst_p` as PNG, quantizing when quality < 90."""
+    #when oxipng will do the heavy compression pass afterwards, skip PIL's
+    #own optimize to avoid paying for zlib search twice
+    have_oxipng = _OXIPNG_BIN or _oxipng_mod is not None
+    pil_optimize = optimize and not have_oxipng
+    if img.mode == "RGBA":
+        _save_buffered(img, dst_p, format="PNG", optimize=pil_optimize)
+    else:
+        if quality < 90:
+            #reduce colors for smaller file
+            colors = max(2, int(256 * quality / 100))
+            if pyimagequant is not None:
+                img = pyimagequant.quantize_pil(
+                    img, max_colors=colors,
+                    quality_min=0, quality_max=quality)
+            else:
+                img = _quantize_adaptive(img, colors)
+        _save_buffered(img, dst_p, format="PNG", optimize=pil_optimize)
+    if optimize and have_oxipng:
+        _optimize_png(dst_p)
+
+
+def _save_fallback(img, src_p, dst_p, **_):
+    """Save `img` in its own format, copying the source file verbatim on failure."""
+    try:
+        img.save(dst_p)
+    except Exception:
+        shutil.copyfile(src_p, dst_p)
+
+
+#one dict lookup instead of a per-file string-compare ladder; also the
+#extension point for new formats
+_EXT_TO_HANDLER = {
+    "JPG": _save_jpeg,
+    "JPEG": _save_jpeg,
+    "WEBP": _save_webp,
+    "PNG": _save_png,
+}
+
+
+def _compress_vips(src_p: Path, dst_p: Path, quality: int, max_size,
+                   optimize: bool, progressive: bool,
+                   preserve_exif: bool) -> CompressResult:
+    """Compress a single image to JPEG through libvips' streaming pipeline.
+
+    Decode, resize and encode happen tile by tile in one pass instead of
+    three full traversals of pixel memory, which matters for large images.
+
+    Args:
+        src_p (Path): Source image path.
+        dst_p (Path): Destination JPEG path.
+        quality (int): JPEG quality (1-100).
+        max_size (tuple or None): Bounding (max_width, max_height).
+        optimize (bool): Optimize Huffman coding tables.
+        progressive (bool): Save as progressive JPEG.
+        preserve_exif (bool): Keep EXIF metadata; stripped otherwise, matching
+            the Pillow path's behavior.
+
+    Returns:
+        CompressResult: Same result tuple as `compress`.
+    """
+    orig_size = src_p.stat().st_size
+    if max_size:
+        mx_w = max_size[0] or _NO_LIMIT
+        mx_h = max_size[1] or _NO_LIMIT
+        img = pyvips.Image.thumbnail(str(src_p), mx_w, height=mx_h,
+                                     size="down")
+    else:
+        img = pyvips.Image.new_from_file(str(src_p), access="sequential")
+    save_kwargs = {"Q": int(quality), "optimize_coding": optimize,
+                   "interlace": progressive}
+    #libvips carries source metadata through the pipeline and writes it out
+    #by default, which would invert preserve_exif=False relative to Pillow
+    try:
+        img.jpegsave(str(dst_p), keep="exif" if preserve_exif else "none",
+                     **save_kwargs)
+    except (TypeError, pyvips.Error):
+        #libvips < 8.15 takes strip instead of keep
+        img.jpegsave(str(dst_p), strip=not preserve_exif, **save_kwargs)
+    new_size = dst_p.stat().st_size
+    return CompressResult(src=str(src_p), dst=str(dst_p),
+                          orig_size=orig_size, new_size=new_size)
+
+
+def _encode_opened(img: Image.Image, src_p: Path, dst_p: Path, quality,
+                   max_size, convert_to, optimize, preserve_exif,
+                   progressive, webp_lossless, webp_method):
+    """Run the convert/resize/save pipeline on an already-opened image.
+
+    Shared by the path-based `compress` and the in-memory async batch path.
+    """
+    #grab EXIF straight off the freshly opened image: convert() and
+    #especially resize() hand back new images whose info dict no longer
+    #carries the source metadata
+    exif_bytes = _get_exif(img) if preserve_exif else None
+    src_format = img.format
+
+    #for JPEG sources being downscaled, let libjpeg decode at a reduced
+    #scale (1/2, 1/4, 1/8) during IDCT; thumbnail() then only has to do
+    #the final fractional step over far fewer pixels
+    if max_size and img.format == "JPEG":
+        mx_w, mx_h = max_size
+        if mx_w > 0 and mx_h > 0:
+            img.draft("RGB", (mx_w * 2, mx_h * 2))
+
+    #convert to RGB if needed
+    if img.mode not in ("RGB", "RGBA", "L"):
+        img = img.convert("RGB")
+
+    img = _resize_if_needed(img, max_size)
+
+    target = (convert_to or src_format or dst_p.suffix.replace(".", "")).upper()
+    handler = _EXT_TO_HANDLER.get(target, _save_fallback)
+    handler(img, src_p, dst_p,
+            quality=quality,
+            optimize=optimize,
+            progressive=progressive,
+            exif_bytes=exif_bytes,
+            webp_lossless=webp_lossless,
+            webp_method=webp_method)
 
 
 def compress(src: str,
@@ -72,7 +454,10 @@ def compress(src: str,
              optimize: bool = True,
              preserve_exif: bool = False,
              progressive: bool = True,
-             webp_lossless: bool = False) -> dict:
+             webp_lossless: bool = False,
+             webp_method: Optional[int] = None,
+             backend: str = "pillow",
+             metadata_only: bool = False) -> CompressResult:
     """Compress a single image file.
     
     Args:
@@ -85,121 +470,357 @@ def compress(src: str,
         preserve_exif (bool, optional): Whether to preserve EXIF metadata. Defaults to False.
         progressive (bool, optional): Save JPEG as progressive. Defaults to True.
         webp_lossless (bool, optional): Save WebP image in lossless mode. Defaults to False.
-        
+        webp_method (int, optional): WebP encoder effort (0-6). Defaults to None,
+            which picks the method from pixel count: slow search on small images,
+            faster methods as size grows.
+        backend (str, optional): "pillow" (default) or "vips". With "vips" and
+            the optional pyvips package installed, JPEG output streams through
+            libvips' fused decode/resize/encode pipeline; other formats (or a
+            missing pyvips) fall back to Pillow.
+        metadata_only (bool, optional): Only carry EXIF from a JPEG source
+            into the JPEG destination, with no pixel decode or encode at all.
+            An existing destination keeps its compressed pixels; a missing one
+            is copied from the source first. Requires the optional piexif
+            package. Defaults to False.
+
     Returns:
-        dict: Dictionary containing:
-            - "src" (str): Source file path.
-            - "dst" (str): Destination file path.
-            - "orig_size" (int): Original file size in bytes.
-            - "new_size" (int): Compressed file size in bytes.
+        CompressResult: Named tuple with fields:
+            - src (str): Source file path.
+            - dst (str): Destination file path.
+            - orig_size (int): Original file size in bytes.
+            - new_size (int): Compressed file size in bytes.
     Raises:
         FileNotFoundError: If the source file does not exist.
         Exception: If the image cannot be saved in its original format and fallback copy fails.
     Example:
         >>> compress("input.jpg", "output.jpg", quality=80, max_size=(800, 600))
-        {'src': 'input.jpg', 'dst': 'output.jpg', 'orig_size': 204800, 'new_size': 102400}
+        CompressResult(src='input.jpg', dst='output.jpg', orig_size=204800, new_size=102400, error=None)
     """
+    _check_libjpeg_turbo()
     src_p = Path(src)
     dst_p = Path(dst)
-    if not src_p.exists():
-        raise FileNotFoundError(f"Source not found: {src}")
+    #one stat serves both the existence check and the size lookup
+    try:
+        orig_size = os.stat(src).st_size
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Source not found: {src}") from None
 
     _ensure_dir(dst_p)
 
-    with Image.open(src_p) as img:
-        orig_size = src_p.stat().st_size
-
-        #convert to RGB if needed
-        if img.mode not in ("RGB", "RGBA", "L"):
-            img = img.convert("RGB")
-
-        img = _resize_if_needed(img, max_size)
-
-        exif_bytes = _get_exif(img) if preserve_exif else None
-        target = (convert_to or img.format or dst_p.suffix.replace(".", "")).upper()
-
-        if target in ("JPG", "JPEG"):
-            save_kwargs = {
-                "format": "JPEG",
-                "quality": int(quality),
-                "optimize": optimize,
-                "progressive": progressive,
-            }
-            if exif_bytes:
-                save_kwargs["exif"] = exif_bytes
-            img.save(dst_p, **save_kwargs)
-
-        elif target == "WEBP":
-            save_kwargs = {
-                "format": "WEBP",
-                "quality": int(quality),
-                "lossless": webp_lossless,
-                "method": 6,
-            }
-            img.save(dst_p, **save_kwargs)
-
-        elif target == "PNG":
-            if img.mode == "RGBA":
-                img.save(dst_p, format="PNG", optimize=optimize)
-            else:
-                if quality < 90:
-                    #reduce colors for smaller file
-                    img = img.convert("P", palette=Image.ADAPTIVE, colors=max(2, int(256 * quality / 100)))
-                img.save(dst_p, format="PNG", optimize=optimize)
+    if metadata_only:
+        if piexif is None:
+            raise RuntimeError("metadata_only=True requires the piexif package")
+        #check for EXIF before touching dst: transplant() raises on sources
+        #without any, and a source with none means there is nothing to carry
+        exif_dict = piexif.load(str(src_p))
+        has_exif = any(exif_dict.get(ifd) for ifd in ("0th", "Exif", "GPS", "1st"))
+        if not dst_p.exists():
+            shutil.copyfile(src_p, dst_p)
+        if has_exif:
+            #EXIF-only update: rewrite the APP1 segment in place, never
+            #touching compressed pixel data
+            piexif.transplant(str(src_p), str(dst_p))
+        return CompressResult(src=str(src_p), dst=str(dst_p),
+                              orig_size=orig_size,
+                              new_size=dst_p.stat().st_size)
 
-        else:
-            #fallback: try saving in current format, else copy
-            try:
-                img.save(dst_p)
-            except Exception:
-                shutil.copyfile(src_p, dst_p)
+    #already-compressed JPEG with nothing to do: re-encoding at quality>=90
+    #would burn a full decode+encode (and often grow the file), so just copy.
+    #Only safe when EXIF is kept, since a copy preserves all metadata.
+    if (max_size is None and convert_to is None and preserve_exif
+            and quality >= 90
+            and src_p.suffix.lower() in (".jpg", ".jpeg")
+            and dst_p.suffix.lower() in (".jpg", ".jpeg")):
+        shutil.copyfile(src_p, dst_p)
+        return CompressResult(src=str(src_p), dst=str(dst_p),
+                              orig_size=orig_size, new_size=orig_size)
+
+    if backend == "vips" and pyvips is not None:
+        vips_target = (convert_to or dst_p.suffix.lstrip(".")).upper()
+        if vips_target in ("JPG", "JPEG"):
+            return _compress_vips(src_p, dst_p, quality, max_size,
+                                  optimize, progressive, preserve_exif)
+        #non-JPEG targets fall through to the Pillow pipeline below
+
+    #1 MiB buffers collapse the per-scanline read()/write() syscalls PIL
+    #would otherwise issue through default-buffered files
+    src_f = open(src_p, "rb", buffering=_IO_BUFFER_SIZE)
+    #widen kernel readahead for the sequential decode; the pages get dropped
+    #again after the save so batch runs don't evict hotter cache entries
+    _fadvise(src_f, "POSIX_FADV_SEQUENTIAL")
+    #large files: map instead of read() so the decoder pages bytes in on
+    #demand and concurrent workers on the same file share them
+    reader = src_f
+    if orig_size > _MMAP_MIN_BYTES:
+        try:
+            reader = mmap.mmap(src_f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            reader = src_f
+    try:
+        with src_f, Image.open(reader) as img:
+            _encode_opened(img, src_p, dst_p, quality, max_size, convert_to,
+                           optimize, preserve_exif, progressive, webp_lossless,
+                           webp_method)
+            _fadvise(src_f, "POSIX_FADV_DONTNEED")
+    finally:
+        if reader is not src_f:
+            reader.close()
 
     new_size = dst_p.stat().st_size
-    return {"src": str(src_p), "dst": str(dst_p), "orig_size": orig_size, "new_size": new_size}
+    #same-format re-encode that came out bigger than the source: the original
+    #file is strictly better, so ship a copy of it instead. Gated on
+    #preserve_exif (like the chunk0-6 fast-path) because the verbatim copy
+    #keeps all source metadata the re-encode was asked to strip.
+    if (new_size > orig_size and max_size is None and convert_to is None
+            and preserve_exif
+            and dst_p.suffix.lower() == src_p.suffix.lower()):
+        shutil.copyfile(src_p, dst_p)
+        new_size = orig_size
+    return CompressResult(src=str(src_p), dst=str(dst_p),
+                          orig_size=orig_size, new_size=new_size)
 
 
 #small batch helper
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+#below this source size, process startup + pickling costs more than the
+#encode itself, so stick with threads (the C encoders release the GIL)
+_PROCESS_MIN_BYTES = 256 * 1024
+
+
+def _cgroup_mem_limit():
+    """Return the container memory limit in bytes, or None if unlimited.
 
+    Reads the cgroup v2 file first, then falls back to v1. Values that mean
+    "no limit" ("max", or absurdly large v1 defaults) return None.
+    """
+    for limit_file in ("/sys/fs/cgroup/memory.max",
+                       "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            raw = Path(limit_file).read_text().strip()
+        except OSError:
+            continue
+        if raw == "max":
+            return None
+        limit = int(raw)
+        #cgroup v1 reports ~2^63 when unconstrained
+        if limit >= 1 << 60:
+            return None
+        return limit
+    return None
+
+
+def _safe_workers(paths):
+    """Pick a worker count that won't exhaust container memory.
+
+    Peeks each image's dimensions (header only, no pixel decode), estimates
+    peak decode memory as two RGBA copies of the largest image, and divides
+    the cgroup memory limit by that. Capped at cpu_count, floored at 1.
+
+    Args:
+        paths (list[Path]): Source image paths.
+
+    Returns:
+        int: Safe number of concurrent workers.
+    """
+    cpus = os.cpu_count() or 4
+    mem_limit = _cgroup_mem_limit()
+    if mem_limit is None:
+        return cpus
+    peak = 0
+    for p in paths:
+        try:
+            with Image.open(p) as img:
+                w, h = img.size
+        except Exception:
+            continue
+        #RGBA decode plus one working copy (resize/convert)
+        peak = max(peak, 4 * w * h * 2)
+    if peak == 0:
+        return cpus
+    return max(1, min(cpus, mem_limit // peak))
 
-def compress_batch(paths, out_dir: str, workers: int = 4, **kwargs):
+
+def _make_worker(quality: int = 85, max_size: Optional[tuple] = None,
+                 convert_to: Optional[str] = None, optimize: bool = True,
+                 preserve_exif: bool = False, progressive: bool = True,
+                 webp_lossless: bool = False, webp_method: Optional[int] = None,
+                 backend: str = "pillow", metadata_only: bool = False):
+    """Partially evaluate `compress` for one batch's fixed configuration.
+
+    Option normalization (int coercion, tuple conversion, target-format
+    casing) happens once here instead of once per file inside the workers.
+    Returns a picklable two-argument callable `(src, dst)` — a
+    `functools.partial` over the module-level `compress`, since process
+    pool workers can't carry real closures.
+
+    Args:
+        Same keyword arguments as `compress`, minus src/dst.
+
+    Returns:
+        Callable[[str, str], CompressResult]: Pre-configured worker.
+    """
+    return partial(compress,
+                   quality=int(quality),
+                   max_size=tuple(max_size) if max_size else None,
+                   convert_to=convert_to.upper() if convert_to else None,
+                   optimize=bool(optimize),
+                   preserve_exif=bool(preserve_exif),
+                   progressive=bool(progressive),
+                   webp_lossless=bool(webp_lossless),
+                   webp_method=webp_method,
+                   backend=backend,
+                   metadata_only=bool(metadata_only))
+
+
+def compress_batch(paths, out_dir: str, workers: Optional[int] = None,
+                   use_processes: bool = True, **kwargs):
     """Compress multiple image files concurrently and save them to the output directory.
 
     Args:
-        paths (list[str] or list[Path]): List of source image file paths to compress.
+        paths (list): Source image paths to compress; str, Path and
+            os.DirEntry (from os.scandir, whose cached stat is reused)
+            all work.
         out_dir (str): Directory where compressed images will be saved.
-        workers (int, optional): Number of concurrent worker threads. Defaults to 4.
+        workers (int, optional): Number of concurrent workers. Defaults to the
+            number of CPUs. Pass 0 to auto-size from the container memory
+            limit so large batches don't get OOM-killed.
+        use_processes (bool, optional): Use a process pool so CPU-bound work
+            (convert, palette quantization) scales past the GIL. Batches of
+            small files fall back to threads automatically. Defaults to True.
         **kwargs: Additional keyword arguments passed to the `compress` function
             (e.g., quality, max_size, convert_to, optimize, preserve_exif, progressive, webp_lossless).
 
     Returns:
-        list[dict]: List of dictionaries with compression results for each image. Each dictionary contains:
-            - "src" (str): Source file path.
-            - "dst" (str, optional): Destination file path (if compression succeeded).
-            - "orig_size" (int, optional): Original file size in bytes.
-            - "new_size" (int, optional): Compressed file size in bytes.
-            - "error" (str, optional): Error message if compression failed.
+        list[CompressResult]: One result per input, in input order. Failed
+            files carry the message in their `error` field.
 
     Example:
         >>> results = compress_batch(["img1.jpg", "img2.png"], "compressed_images", quality=80)
-        >>> results
-        [
-            {'src': 'img1.jpg', 'dst': 'compressed_images/img1.jpg', 'orig_size': 204800, 'new_size': 102400},
-            {'src': 'img2.png', 'dst': 'compressed_images/img2.png', 'orig_size': 512000, 'new_size': 256000}
-        ]
+        >>> results[0]
+        CompressResult(src='img1.jpg', dst='compressed_images/img1.jpg', orig_size=204800, new_size=102400, error=None)
     """
     out_dir_p = Path(out_dir)
     out_dir_p.mkdir(parents=True, exist_ok=True)
-    results = []
-    with ThreadPoolExecutor(max_workers=workers) as ex:
+    #resolve (path, name, size) once per entry; os.DirEntry items from
+    #os.scandir carry a cached stat, so no extra syscall at all for them
+    entries = []
+    for p in paths:
+        src = os.fspath(p)
+        try:
+            size = p.stat().st_size if isinstance(p, os.DirEntry) else os.stat(src).st_size
+        except OSError:
+            size = 0
+        entries.append((src, os.path.basename(src), size))
+    if workers == 0:
+        workers = _safe_workers([src for src, _, _ in entries])
+    elif workers is None:
+        workers = os.cpu_count() or 4
+    if use_processes:
+        #tiny files: pickling/dispatch overhead dominates, threads win
+        use_processes = any(size >= _PROCESS_MIN_BYTES for _, _, size in entries)
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    #preallocate and assign by index: no list reallocation, and results come
+    #back in input order regardless of completion order
+    results = [None] * len(entries)
+    #bind the batch's settings once instead of re-validating them per file
+    worker = _make_worker(**kwargs)
+    with executor_cls(max_workers=workers) as ex:
         futures = {}
-        for p in paths:
-            p = Path(p)
-            dst = out_dir_p / p.name
-            futures[ex.submit(compress, str(p), str(dst), **kwargs)] = str(p)
+        for i, (src, name, _) in enumerate(entries):
+            dst = out_dir_p / name
+            futures[ex.submit(worker, src, str(dst))] = (i, src)
         for fut in as_completed(futures):
+            i, src = futures[fut]
             try:
-                results.append(fut.result())
+                results[i] = fut.result()
             except Exception as e:
-                results.append({"src": futures[fut], "error": str(e)})
+                results[i] = CompressResult(src=src, error=str(e))
     return results
+
+
+def _compress_from_bytes(data: bytes, src: str, dst: str, cfg: dict) -> CompressResult:
+    """Compress pre-read source bytes; worker for `compress_batch_async`.
+
+    `cfg` is the normalized option dict a `_make_worker` partial carries, so
+    every key is guaranteed present.
+    """
+    src_p = Path(src)
+    dst_p = Path(dst)
+    _ensure_dir(dst_p)
+    with Image.open(io.BytesIO(data)) as img:
+        _encode_opened(img, src_p, dst_p,
+                       cfg["quality"], cfg["max_size"], cfg["convert_to"],
+                       cfg["optimize"], cfg["preserve_exif"],
+                       cfg["progressive"], cfg["webp_lossless"],
+                       cfg["webp_method"])
+    return CompressResult(src=src, dst=dst,
+                          orig_size=len(data), new_size=dst_p.stat().st_size)
+
+
+async def compress_batch_async(paths, out_dir: str, workers: Optional[int] = None,
+                               read_ahead: int = 32, **kwargs):
+    """Compress multiple images with reads pipelined ahead of the encoders.
+
+    The synchronous batch caps I/O queue depth at the worker count, which
+    leaves fast SSDs idle between encodes. This variant keeps a rolling
+    window of `read_ahead` outstanding file reads feeding CPU-bound encode
+    workers from in-memory buffers.
+
+    Args:
+        paths (list[str] or list[Path]): List of source image file paths to compress.
+        out_dir (str): Directory where compressed images will be saved.
+        workers (int, optional): Number of concurrent encode workers.
+            Defaults to the number of CPUs.
+        read_ahead (int, optional): Maximum outstanding source reads.
+            Defaults to 32, enough to keep NVMe queues busy.
+        **kwargs: Additional keyword arguments passed to the `compress` function
+            (e.g., quality, max_size, convert_to, optimize, preserve_exif, progressive, webp_lossless).
+
+    Returns:
+        list[CompressResult]: Same results as `compress_batch`, in input order.
+
+    Example:
+        >>> results = asyncio.run(compress_batch_async(["img1.jpg"], "out", quality=80))
+    """
+    out_dir_p = Path(out_dir)
+    out_dir_p.mkdir(parents=True, exist_ok=True)
+    if workers is None:
+        workers = os.cpu_count() or 4
+    #normalize and validate the options once; a misspelled kwarg raises
+    #TypeError here instead of silently re-encoding the batch with defaults
+    worker = _make_worker(**kwargs)
+    cfg = worker.keywords
+    #metadata_only and the vips backend work on paths, not pre-read buffers
+    path_based = cfg["metadata_only"] or cfg["backend"] == "vips"
+    loop = asyncio.get_running_loop()
+    read_sem = asyncio.Semaphore(read_ahead)
+    encode_sem = asyncio.Semaphore(workers)
+
+    async def _one(p, ex):
+        p = Path(p)
+        dst = out_dir_p / p.name
+        try:
+            if path_based:
+                async with encode_sem:
+                    return await loop.run_in_executor(
+                        ex, worker, str(p), str(dst))
+            #hold the read slot until an encode slot is acquired, so at most
+            #read_ahead buffers exist at once even when encode is the
+            #bottleneck; releasing earlier would let the whole batch pile up
+            #in memory
+            async with read_sem:
+                data = await loop.run_in_executor(ex, p.read_bytes)
+                await encode_sem.acquire()
+            try:
+                return await loop.run_in_executor(
+                    ex, _compress_from_bytes, data, str(p), str(dst), cfg)
+            finally:
+                encode_sem.release()
+        except Exception as e:
+            return CompressResult(src=str(p), error=str(e))
+
+    #one pool serves both stages: reads release the GIL in the kernel and
+    #the heavy encode work releases it inside PIL's C encoders
+    with ThreadPoolExecutor(max_workers=workers + read_ahead) as ex:
+        return list(await asyncio.gather(*(_one(p, ex) for p in paths)))